@@ -14,12 +14,17 @@ HELLO_INTERVAL = 1.0
 NEIGHBOR_DEAD_INTERVAL = 2.5
 LSA_FLOOD_PORT = 50000
 BUFFER_SIZE = 65535
+BACKBONE_AREA = "0"
 
 
 def load_config(path):
     with open(path) as f:
         return json.load(f)
 
+def area_key(area):
+    # normaliza o id da area (o json pode trazer 0 ou "0")
+    return BACKBONE_AREA if area is None else str(area)
+
 class RouterDaemon:
     def __init__(self, cfg):
         self.cfg = cfg
@@ -28,16 +33,56 @@ class RouterDaemon:
         self.port = cfg.get('port', LSA_FLOOD_PORT)
         self.neighbors_last_seen = {n['id']: 0 for n in self.cfg.get('neighbors', [])}
 
-        # LSDB: dict key -> link_id, value -> {...}
-        self.lsdb = {}
+        # area padrao do roteador; vizinhos e redes podem sobrescrever com "area"
+        self.area = area_key(cfg.get('area', BACKBONE_AREA))
+        self.neighbor_area = { n['id']: area_key(n.get('area', self.area)) for n in self.cfg.get('neighbors', []) }
+
+        # attached_networks aceita "10.0.1.0/24" ou {"network": "10.0.1.0/24", "area": 1}
+        self.attached_networks = []
+        self.network_area = {}
+        for entry in self.cfg.get('attached_networks', []):
+            if isinstance(entry, dict):
+                net = entry['network']
+                self.network_area[net] = area_key(entry.get('area', self.area))
+            else:
+                net = entry
+                self.network_area[net] = self.area
+            self.attached_networks.append(net)
+
+        # areas em que o roteador tem interface; mais de uma -> area border router
+        self.areas = set(self.neighbor_area.values()) | set(self.network_area.values())
+        if not self.areas:
+            self.areas = {self.area}
+        self.is_abr = len(self.areas) > 1
+
+        # prefixos usados pelo ABR para agregar as redes de cada area: area -> [rede]
+        self.area_ranges = {
+            area_key(area): [ipaddress.ip_network(p, strict=False) for p in prefixes]
+            for area, prefixes in self.cfg.get('area_ranges', {}).items()
+        }
+
+        # LSDB por area: area -> {link_id -> {...}}
+        self.lsdbs = { area: {} for area in self.areas }
         self.lsdb_lock = threading.Lock()
 
+        # cache do ABR: area de origem -> prefixos/custos (1 SPF por area) e
+        # area destino -> lista de SUMs pronta pro advertise; refeito so quando a LSDB muda
+        self.area_summaries = {}
+        self.summaries = {}
+        self.summary_lock = threading.Lock()
+
         # reservations: (link_id -> reserved_bw)
         self.reservations = {}
 
-        # seen LSAs to avoid reprocessing (origin, seq)
+        # seen LSAs to avoid reprocessing (area, origin, seq)
         self.seen_lsas = set()
 
+        # ultimo seq aplicado por (area, origin), pra um LSA antigo nao sobrescrever um novo
+        self.lsa_seq = {}
+
+        # sumarios iniciais do ABR (redes proprias); o SPF precisa das reservations
+        self.refresh_summaries(self.areas)
+
         # UDP socket bound to port on all interfaces
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sock.bind(('0.0.0.0', self.port))
@@ -45,9 +90,6 @@ class RouterDaemon:
         # quick map: neighbor id -> neighbor dict from config
         self.neigh_by_id = { n['id']: n for n in self.cfg.get('neighbors', []) }
 
-        # ensure attached_networks exists
-        self.attached_networks = list(self.cfg.get('attached_networks', []))
-
     # --------------------- start / background tasks ---------------------
     def start(self):
         threading.Thread(target=self.recv_loop, daemon=True).start()
@@ -61,7 +103,7 @@ class RouterDaemon:
         # esperar um pouco pro lsa se proparar e entao tentar instalar as rotas nas redes conhecidas
         threading.Thread(target=self.bootstrap_install_routes, daemon=True).start()
 
-        print(f"[{self.id}] Daemon started (port={self.port})")
+        print(f"[{self.id}] Daemon started (port={self.port}, areas={sorted(self.areas)}, abr={self.is_abr})")
 
     # manda REQUEST/INSTALL dps de um tempo 
     def bootstrap_install_routes(self):
@@ -69,12 +111,13 @@ class RouterDaemon:
         self.advertise_links()
         time.sleep(1.0)
 
-        # pega as redes da lsdb + proprias redes adjacentes
+        # pega as redes da lsdb (intra-area e sumarios) + proprias redes adjacentes
         networks = set(self.attached_networks)
         with self.lsdb_lock:
-            for lid, link in list(self.lsdb.items()):
-                if 'network' in link:
-                    networks.add(link['network'])
+            for lsdb in self.lsdbs.values():
+                for lid, link in list(lsdb.items()):
+                    if 'network' in link:
+                        networks.add(link['network'])
 
         # pra cada, pega um ip de host e tenta instalar a rota
         for net in networks:
@@ -90,8 +133,8 @@ class RouterDaemon:
                 # computa o caminho
                 path = self.compute_cspf(candidate, bw_required=0)
                 if path:
-                    print(f"[{self.id}] bootstrap installing route to network of {candidate} via path {path}")
-                    self.install_path(path, candidate, bw=0)
+                    print(f"[{self.id}] bootstrap installing route to network {net} via path {path}")
+                    self.install_path(path, net, bw=0)
                 else:
                     print(f"[{self.id}] bootstrap: no path to network {net}")
             except Exception as e:
@@ -139,8 +182,12 @@ class RouterDaemon:
     # --------------------- LSA flood / advertise ---------------------
     def flood_lsa(self, lsa, exclude_ip=None):
         now = time.time()
+        area = area_key(lsa.get('area', BACKBONE_AREA))
         for n in self.cfg.get('neighbors', []):
             dest_ip = n.get('ip')
+            # LSAs nunca saem da area em que foram originados
+            if self.neighbor_area.get(n['id']) != area:
+                continue
             # skip excluded IP
             if exclude_ip and dest_ip == exclude_ip:
                 continue
@@ -155,11 +202,17 @@ class RouterDaemon:
                     print(f"[{self.id}] flood_lsa err to {dest_ip}: {e}")
 
     def advertise_links(self):
-        lsa = {
-            "type": "LSA_LINK",
-            "origin": self.id,
-            "seq": int(time.time()),
-            "links": []
+        # um LSA por area, cada um com apenas os links/redes daquela area
+        seq = int(time.time())
+        lsas = {
+            area: {
+                "type": "LSA_LINK",
+                "origin": self.id,
+                "area": area,
+                "seq": seq,
+                "links": []
+            }
+            for area in self.areas
         }
         now = time.time()
         for n_config in self.cfg.get('neighbors', []):
@@ -179,18 +232,104 @@ class RouterDaemon:
                     "ip_a": local_iface_ip,
                     "ip_b": remote_iface_ip
                 }
-                lsa['links'].append(link)
+                lsas[self.neighbor_area[neighbor_id]]['links'].append(link)
 
         for net in self.attached_networks:
-            lsa['links'].append({
+            lsas[self.network_area[net]]['links'].append({
                 "id": f"{self.id}-net-{net}",
                 "a": self.id,
                 "b": "NET",
                 "network": net
             })
 
-        print(f"[{self.id}] advertising LSA (links={len(lsa['links'])})")
-        self.flood_lsa(lsa)
+        # ABR: anuncia em cada area os prefixos (agregados) das outras areas
+        if self.is_abr:
+            for area, lsa in lsas.items():
+                lsa['links'].extend(self.summaries.get(area, []))
+
+        for area, lsa in lsas.items():
+            print(f"[{self.id}] advertising LSA area={area} (links={len(lsa['links'])})")
+            self.flood_lsa(lsa)
+
+    def summarize(self, area, net):
+        # troca a rede pelo range configurado da area que a contem, se houver
+        try:
+            netobj = ipaddress.ip_network(net)
+        except Exception:
+            return net
+        for prefix in self.area_ranges.get(area, []):
+            if netobj.version == prefix.version and netobj.subnet_of(prefix):
+                return str(prefix)
+        return net
+
+    def refresh_summaries(self, changed_areas):
+        if not self.is_abr:
+            return
+        with self.summary_lock:
+            for area in changed_areas:
+                if area in self.lsdbs:
+                    self.area_summaries[area] = self.compute_area_summaries(area)
+            # as listas por area destino sao so um merge, sem SPF
+            for area in self.areas:
+                self.summaries[area] = self.build_summaries(area)
+
+    def compute_area_summaries(self, area):
+        # prefixos da area (agregados) e sumarios do backbone, com custo a partir deste ABR
+        # resultado: prefixo -> (custo, area de onde o prefixo vem)
+        dist, _ = self.spf(area)
+        prefixes = [(net, 0) for net in self.attached_networks if self.network_area[net] == area]
+        relayed = {}
+        with self.lsdb_lock:
+            entries = list(self.lsdbs[area].values())
+        for link in entries:
+            origin = link.get('a')
+            if origin not in dist:
+                continue
+            if link.get('b') == 'NET':
+                prefixes.append((link['network'], dist[origin]))
+            # rotas inter-area aprendidas no backbone descem para as areas nao-backbone,
+            # menos as de areas em que este ABR esta (essas ele ja anuncia, e repassar faz loop)
+            elif link.get('b') == 'SUM' and area == BACKBONE_AREA and origin != self.id:
+                src_area = link.get('src_area')
+                if src_area in self.areas:
+                    continue
+                cost = dist[origin] + link.get('cost', 0)
+                if link['network'] not in relayed or cost < relayed[link['network']][0]:
+                    relayed[link['network']] = (cost, src_area)
+
+        # dentro de uma area o range agregado custa o da rede mais distante
+        summaries = {}
+        for net, cost in prefixes:
+            prefix = self.summarize(area, net)
+            summaries[prefix] = (max(cost, summaries.get(prefix, (0, area))[0]), area)
+        for prefix, (cost, src_area) in relayed.items():
+            if prefix not in summaries or cost < summaries[prefix][0]:
+                summaries[prefix] = (cost, src_area)
+        return summaries
+
+    def build_summaries(self, target_area):
+        # prefixo -> (custo, area de origem) a partir deste ABR (menor custo entre areas)
+        best = {}
+        for area in sorted(self.areas):
+            if area == target_area or area not in self.area_summaries:
+                continue
+            for prefix, (cost, src_area) in self.area_summaries[area].items():
+                if src_area == target_area:
+                    continue
+                if prefix not in best or cost < best[prefix][0]:
+                    best[prefix] = (cost, src_area)
+
+        return [
+            {
+                "id": f"{self.id}-sum-{prefix}",
+                "a": self.id,
+                "b": "SUM",
+                "network": prefix,
+                "cost": cost,
+                "src_area": src_area
+            }
+            for prefix, (cost, src_area) in sorted(best.items())
+        ]
 
     # --------------------- message handling ---------------------
     def handle_msg(self, msg, addr):
@@ -215,24 +354,40 @@ class RouterDaemon:
         if mtype == 'LSA_LINK':
             origin = msg.get('origin')
             seq = msg.get('seq', 0)
-            key = (origin, seq)
+            area = area_key(msg.get('area', BACKBONE_AREA))
+            if area not in self.lsdbs:
+                # LSA de uma area onde nao temos interface: nao guarda nem re-inunda
+                return
+            key = (area, origin, seq)
             if key in self.seen_lsas:
                 return
             # marca como visto antes de processar para evitar loops em caso de reentrância
             self.seen_lsas.add(key)
+            if seq < self.lsa_seq.get((area, origin), 0):
+                return
+            self.lsa_seq[(area, origin)] = seq
             lsdb_changed = False
             try:
                 # update LSDB
                 with self.lsdb_lock:
-                    for link in msg.get('links', []):
-                        lid = link.get('id')
+                    lsdb = self.lsdbs[area]
+                    links = { link.get('id'): link for link in msg.get('links', []) }
+                    # o LSA traz o estado completo do origin na area: o que ele nao anuncia mais
+                    # (links, redes, SUMs) sai da LSDB
+                    for lid, link in list(lsdb.items()):
+                        if link.get('a') == origin and lid not in links:
+                            print(f"[{self.id}] Removendo {lid} retirado por {origin} do LSDB (area {area}).")
+                            del lsdb[lid]
+                            self.reservations.pop(lid, None)
+                            lsdb_changed = True
+                    for lid, link in links.items():
                         # se não existir ou for diferente, atualiza e marca mudança
-                        if lid not in self.lsdb or self.lsdb[lid] != link:
-                            self.lsdb[lid] = link
+                        if lid not in lsdb or lsdb[lid] != link:
+                            lsdb[lid] = link
                             lsdb_changed = True
 
-                    print(f"--- LSDB atualizado em {self.id} ---")
-                    pprint(self.lsdb)
+                    print(f"--- LSDB (area {area}) atualizado em {self.id} ---")
+                    pprint(lsdb)
             except Exception as e:
                 print(f"[{self.id}] erro ao atualizar LSDB: {e}")
                 traceback.print_exc()
@@ -244,6 +399,7 @@ class RouterDaemon:
                 print(f"[{self.id}] flood after LSA err: {e}")
 
             if lsdb_changed:
+                self.refresh_summaries([area])
                 print(f"[{self.id}] LSDB mudou. Reavaliando todas as rotas para garantir otimalidade.")
                 threading.Thread(target=self.bootstrap_install_routes, daemon=True).start()
             return
@@ -281,39 +437,73 @@ class RouterDaemon:
         print(f"[{self.id}] unknown msg type: {mtype} from {addr}")
 
     # --------------------- CSPF / path computation ---------------------
-    def compute_cspf(self, dest_ip, bw_required):
-        # acha o destino procurando na lsdb das attached networks
-        dest_router = None
+    def find_intra_area_router(self, dest_ip):
+        # acha o destino procurando na lsdb das attached networks de cada area
         with self.lsdb_lock:
-            for lid, link in self.lsdb.items():
-                if link.get('b') == 'NET' and 'network' in link:
+            for area in sorted(self.areas):
+                for lid, link in self.lsdbs[area].items():
+                    if link.get('b') == 'NET' and 'network' in link:
+                        try:
+                            net = ipaddress.ip_network(link['network'])
+                            if ipaddress.ip_address(dest_ip) in net:
+                                return link['a'], area
+                        except Exception:
+                            continue
+        # verifica se nao esta talvez nas attached
+        for net in self.attached_networks:
+            try:
+                if ipaddress.ip_address(dest_ip) in ipaddress.ip_network(net):
+                    return self.id, self.network_area[net]
+            except Exception:
+                pass
+        return None, None
+
+    def find_inter_area_router(self, dest_ip, bw_required):
+        # escolhe o ABR pelo sumario mais especifico e, no empate, pelo menor custo total;
+        # devolve tambem o SPF da area escolhida para o compute_cspf nao refazer
+        best = None
+        try:
+            addr = ipaddress.ip_address(dest_ip)
+        except Exception:
+            return None, None, None
+        for area in sorted(self.areas):
+            # ABR so usa sumarios do backbone (como no OSPF)
+            if self.is_abr and area != BACKBONE_AREA:
+                continue
+            candidates = []
+            with self.lsdb_lock:
+                for lid, link in self.lsdbs[area].items():
+                    if link.get('b') != 'SUM' or link.get('a') == self.id:
+                        continue
                     try:
                         net = ipaddress.ip_network(link['network'])
-                        if ipaddress.ip_address(dest_ip) in net:
-                            dest_router = link['a'] 
-                            break
                     except Exception:
                         continue
-            # verifica se nao esta talvez nas attached
-            if not dest_router:
-                for net in self.attached_networks:
-                    try:
-                        if ipaddress.ip_address(dest_ip) in ipaddress.ip_network(net):
-                            dest_router = self.id
-                            break
-                    except Exception:
-                        pass
-
-        if not dest_router:
-            # print(f"[{self.id}] destination router not found in LSDB for {dest_ip}")
-            return None
-
+                    if addr in net:
+                        candidates.append((net, link))
+            # ABR nunca usa sumario de uma area em que ele proprio esta
+            if self.is_abr:
+                candidates = [(net, link) for net, link in candidates if link.get('src_area') not in self.areas]
+            if not candidates:
+                continue
+            dist, prev = self.spf(area, bw_required)
+            for net, link in candidates:
+                if link['a'] not in dist:
+                    continue
+                rank = (-net.prefixlen, dist[link['a']] + link.get('cost', 0))
+                if best is None or rank < best[0]:
+                    best = (rank, link['a'], area, prev)
+        if best is None:
+            return None, None, None
+        return best[1], best[2], best[3]
+
+    def spf(self, area, bw_required=0, dest_router=None):
         # Build adjacency with weights and include per-link IPs for constructing next-hop IPs
         graph = {}
         with self.lsdb_lock:
-            for lid, link in self.lsdb.items():
-                # skip attached network entries
-                if link.get('b') == 'NET' or 'network' in link:
+            for lid, link in self.lsdbs.get(area, {}).items():
+                # skip attached network / summary entries
+                if link.get('b') in ('NET', 'SUM') or 'network' in link:
                     continue
                 a = link.get('a'); b = link.get('b')
                 cap = link.get('capacity', 100)
@@ -333,13 +523,11 @@ class RouterDaemon:
                 graph.setdefault(a, []).append((b, metric, lid, ip_b))  # to reach b, next hop ip is ip_b
                 graph.setdefault(b, []).append((a, metric, lid, ip_a))  # to reach a, next hop ip is ip_a
 
-        # aplica o Dijkstra a partir do roteador atual 
+        # aplica o Dijkstra a partir do roteador atual, so dentro da area
         dist = {self.id: 0}
         prev = {}
         heap = [(0, self.id)]
-        print(self.id, dest_router)
         while heap:
-            print(heap)
             d, u = heapq.heappop(heap)
             if u == dest_router:
                 break
@@ -351,6 +539,21 @@ class RouterDaemon:
                     dist[v] = nd
                     prev[v] = (u, lid, next_ip)  # from v go back to u via lid; next_ip is v-side IP on that link
                     heapq.heappush(heap, (nd, v))
+        return dist, prev
+
+    def compute_cspf(self, dest_ip, bw_required):
+        # rota intra-area tem preferencia; senao vai ate o ABR que anunciou o sumario
+        prev = None
+        dest_router, area = self.find_intra_area_router(dest_ip)
+        if not dest_router:
+            dest_router, area, prev = self.find_inter_area_router(dest_ip, bw_required)
+
+        if not dest_router:
+            # print(f"[{self.id}] destination router not found in LSDB for {dest_ip}")
+            return None
+
+        if prev is None:
+            dist, prev = self.spf(area, bw_required, dest_router)
 
         if dest_router not in prev and dest_router != self.id:
             return None
@@ -370,7 +573,7 @@ class RouterDaemon:
             # find in lsdb the link between self.id and first_hop[0] to obtain our local interface IP
             our_iface_ip = self.local_ip
             with self.lsdb_lock:
-                for lid, link in self.lsdb.items():
+                for lid, link in self.lsdbs[area].items():
                     if link.get('a') == self.id and link.get('b') == first_hop[0]:
                         our_iface_ip = link.get('ip_a', our_iface_ip)
                         break
@@ -395,9 +598,9 @@ class RouterDaemon:
             lid1 = f"{cur[0]}-{nxt[0]}"
             lid2 = f"{nxt[0]}-{cur[0]}"
             with self.lsdb_lock:
-                if lid1 in self.lsdb:
+                if any(lid1 in lsdb for lsdb in self.lsdbs.values()):
                     lid = lid1
-                elif lid2 in self.lsdb:
+                elif any(lid2 in lsdb for lsdb in self.lsdbs.values()):
                     lid = lid2
                 else:
                     lid = nxt[1]
@@ -432,12 +635,15 @@ class RouterDaemon:
                 if not target_ip:
                     # fallback: procura lsdb por um link onde a==roteador_id e b==self.id (or inverse)
                     with self.lsdb_lock:
-                        for lid, link in self.lsdb.items():
-                            if link.get('a') == this_router_id and link.get('b') == self.id:
-                                target_ip = link.get('ip_a')
-                                break
-                            if link.get('b') == this_router_id and link.get('a') == self.id:
-                                target_ip = link.get('ip_b')
+                        for lsdb in self.lsdbs.values():
+                            for lid, link in lsdb.items():
+                                if link.get('a') == this_router_id and link.get('b') == self.id:
+                                    target_ip = link.get('ip_a')
+                                    break
+                                if link.get('b') == this_router_id and link.get('a') == self.id:
+                                    target_ip = link.get('ip_b')
+                                    break
+                            if target_ip:
                                 break
                 if target_ip:
                     msg = {"type":"INSTALL_ROUTE", "dest": str(dest_net), "next": next_hop_ip}
@@ -477,16 +683,17 @@ class RouterDaemon:
         links_to_remove = []
         # 1. Encontrar todos os links que envolvem o(s) vizinho(s) morto(s)
         with self.lsdb_lock:
-            for link_id, link_data in list(self.lsdb.items()):
-                # Um link é considerado morto se uma de suas pontas for um dos vizinhos caídos
-                if link_data.get('a') in dead_neighbors or link_data.get('b') in dead_neighbors:
-                    links_to_remove.append(link_id)
+            for area, lsdb in self.lsdbs.items():
+                for link_id, link_data in list(lsdb.items()):
+                    # Um link é considerado morto se uma de suas pontas for um dos vizinhos caídos
+                    if link_data.get('a') in dead_neighbors or link_data.get('b') in dead_neighbors:
+                        links_to_remove.append((area, link_id))
 
             # 2. Remover os links mortos da base de dados local (LSDB) e limpar reservas
-            for link_id in links_to_remove:
-                if link_id in self.lsdb:
-                    print(f"[{self.id}] Removendo link morto {link_id} do LSDB.")
-                    del self.lsdb[link_id]
+            for area, link_id in links_to_remove:
+                if link_id in self.lsdbs[area]:
+                    print(f"[{self.id}] Removendo link morto {link_id} do LSDB (area {area}).")
+                    del self.lsdbs[area][link_id]
                 # também remover qualquer reserva associada
                 if link_id in self.reservations:
                     print(f"[{self.id}] Limpando reserva associada ao link {link_id}.")
@@ -494,6 +701,7 @@ class RouterDaemon:
 
         # 3. Se alguma mudança foi feita no LSDB, reagir à mudança de topologia
         if links_to_remove:
+            self.refresh_summaries({area for area, link_id in links_to_remove})
             # Primeiro, removemos oficialmente o vizinho da nossa lista de vizinhos "vivos"
             for neighbor_id in dead_neighbors:
                 if neighbor_id in self.neighbors_last_seen: